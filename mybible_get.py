@@ -1,25 +1,56 @@
 #!/usr/bin/env python3
 import click
-import requests
 import sqlite3
 import json
+import codecs
 import zipfile
+import zlib
+import struct
 import io
+import hashlib
+import mmap
 import os
+import re
 import sys
 import shutil
+import subprocess
+import uuid
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime, timezone
-from functools import wraps
+from email.utils import parsedate_to_datetime
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+from itertools import takewhile
 import operator
 from rich.console import Console
-from rich.panel import Panel
-from rich.text import Text
 from rich.markup import escape
-from rich.box import ROUNDED
-from rich.rule import Rule
-from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TimeElapsedColumn
+# requests and the heavier rich renderables (Panel, Table, Progress, ...) are
+# imported by the functions that use them, keeping startup, '--help' and
+# purely local commands from paying for them
+
+# Optional SIMD-accelerated inflate (ISA-L or zlib-ng); stdlib zlib otherwise.
+try:
+    from isal import isal_zlib as _fast_zlib
+except ImportError:
+    try:
+        from zlib_ng import zlib_ng as _fast_zlib
+    except ImportError:
+        _fast_zlib = None
+
+# Optional streaming JSON parser for large registries, used without orjson
+# to keep memory low.
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Optional SIMD JSON decoder for whole-document registry parsing.
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
 
 # --- CONFIGURATION ---
 APP_NAME = "mybible-get"
@@ -39,7 +70,7 @@ DOWNLOAD_CACHE_DIR = CACHE_DIR / "downloads"
 REGISTRY_CACHE_DIR = CACHE_DIR / "registries"
 CACHE_DB_PATH = CACHE_DIR / "cache.db"
 CONFIG_FILE_PATH = CONFIG_DIR / "config.json"
-ETAG_CACHE_PATH = CONFIG_DIR / "etags.json"
+ETAG_CACHE_PATH = CONFIG_DIR / "etags.json"  # legacy, superseded by cache.db 'source_meta'
 
 DEFAULT_SOURCES = {
     "mybible.zone.registry": "https://mybible.zone/repository/registry/registry.zip",
@@ -54,19 +85,49 @@ DEFAULT_SOURCES = {
 
 console = Console()
 
+HTTP_POOL_SIZE = 8
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# Shared by registry updates and module downloads for connection reuse;
+# created on first use
+@lru_cache(maxsize=1)
+def get_http_session():
+    import requests
+    import requests.adapters
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 # ---------------------------------------------------------------------------
 # Cache DB  (CACHE_DIR/cache.db)
-# Table: cached_modules  — identical schema to mybible-cli-java
+# Table: cached_modules  — same columns as mybible-cli-java; the key also
+# includes source_registry, so a module listed by several registries keeps one
+# row per registry and each source can be refreshed on its own
 # ---------------------------------------------------------------------------
 
+# Connections are opened once per process and reused, so the PRAGMAs below run
+# once instead of on every query. 'with conn:' only scopes a transaction.
+@lru_cache(maxsize=1)
 def _cache_conn():
     CACHE_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
     conn = sqlite3.connect(str(CACHE_DB_PATH))
     conn.row_factory = sqlite3.Row
+    # The cache is rebuilt by 'update' at any time, so durability is traded for speed
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -64000")
+    conn.execute("PRAGMA mmap_size = 268435456")
     return conn
 
 def ensure_cache_db():
     with _cache_conn() as conn:
+        # Caches keyed without source_registry are dropped; 'update' rebuilds them
+        pk = {r["name"] for r in conn.execute("PRAGMA table_info(cached_modules)") if r["pk"]}
+        if pk and "source_registry" not in pk:
+            conn.execute("DROP TABLE cached_modules")
         conn.executescript("""
             CREATE TABLE IF NOT EXISTS cached_modules (
                 name            TEXT NOT NULL,
@@ -78,11 +139,18 @@ def ensure_cache_db():
                 module_type     TEXT NOT NULL,
                 size            TEXT,
                 source_registry TEXT NOT NULL,
-                PRIMARY KEY (name, update_date, download_url)
+                PRIMARY KEY (name, update_date, download_url, source_registry)
             );
-            CREATE INDEX IF NOT EXISTS idx_module_name ON cached_modules(name);
+            DROP INDEX IF EXISTS idx_module_name;
+            CREATE INDEX IF NOT EXISTS idx_module_name_date
+                ON cached_modules(name COLLATE NOCASE, update_date DESC, source_registry);
             CREATE INDEX IF NOT EXISTS idx_module_type ON cached_modules(module_type);
             CREATE INDEX IF NOT EXISTS idx_language    ON cached_modules(language);
+            CREATE TABLE IF NOT EXISTS source_meta (
+                url           TEXT PRIMARY KEY,
+                etag          TEXT,
+                last_modified TEXT
+            );
         """)
 
 def is_cache_empty():
@@ -95,27 +163,65 @@ def is_cache_empty():
     except sqlite3.Error:
         return True
 
-def _cache_insert_many(modules):
+CACHE_COLUMNS = (
+    "name", "language", "description", "update_date", "download_url",
+    "file_name", "module_type", "size", "source_registry",
+)
+_CACHE_INSERT_SQL = (
+    f"INSERT OR IGNORE INTO cached_modules ({','.join(CACHE_COLUMNS)}) "
+    f"VALUES ({','.join('?' * len(CACHE_COLUMNS))})"
+)
+_cache_row = operator.itemgetter(*CACHE_COLUMNS)
+
+SQL_IN_BATCH = 500  # stays under SQLite's host-parameter limit
+
+def _in_batches(names):
+    """Yields (placeholders, batch) pairs for parameterized 'IN (...)' queries."""
+    names = list(names)
+    for i in range(0, len(names), SQL_IN_BATCH):
+        batch = names[i:i + SQL_IN_BATCH]
+        yield ','.join('?' * len(batch)), batch
+
+def _cache_insert_many(conn, modules):
+    """Inserts an iterable of module dicts; the caller owns the transaction."""
+    # executemany binds one row at a time from the iterator, so the
+    # parameter limit does not apply and rows are never materialized
+    conn.executemany(_CACHE_INSERT_SQL, map(_cache_row, modules))
+
+def _cache_get_validators():
+    """Returns {url: {"etag": ..., "last_modified": ...}} for all known sources."""
     with _cache_conn() as conn:
-        conn.executemany(
-            "INSERT OR IGNORE INTO cached_modules "
-            "(name,language,description,update_date,download_url,file_name,module_type,size,source_registry) "
-            "VALUES (:name,:language,:description,:update_date,:download_url,:file_name,:module_type,:size,:source_registry)",
-            modules,
-        )
+        return {
+            r["url"]: {"etag": r["etag"], "last_modified": r["last_modified"]}
+            for r in conn.execute("SELECT url, etag, last_modified FROM source_meta")
+        }
+
+def _cache_save_validators(conn, url, validators):
+    """
+    Records the HTTP validators of one source; the caller owns the transaction.
+    A row without validators is kept too: it marks a source that sends none,
+    so update does not HEAD-probe it again.
+    """
+    conn.execute(
+        "INSERT OR REPLACE INTO source_meta (url, etag, last_modified) VALUES (?,?,?)",
+        [url, validators.get("etag"), validators.get("last_modified")],
+    )
 
 def _cache_get_module(name, version=None):
-    sql = "SELECT * FROM cached_modules WHERE LOWER(name) LIKE LOWER(?)"
+    sql = "SELECT * FROM cached_modules WHERE name = ? COLLATE NOCASE"
     params = [name]
     if version:
         sql += " AND update_date = ?"
         params.append(version)
-    sql += " ORDER BY update_date DESC LIMIT 1"
+    # source_registry breaks ties between registries listing the same version
+    sql += " ORDER BY update_date DESC, source_registry LIMIT 1"
     with _cache_conn() as conn:
         return conn.execute(sql, params).fetchone()
 
 def _cache_list(language=None, module_type=None):
-    sql = "SELECT * FROM cached_modules WHERE 1=1"
+    # MAX() makes SQLite take the bare columns from each name's newest row;
+    # idx_module_name_date serves both the grouping and the ordering.
+    sql = "SELECT *, MAX(update_date) AS latest FROM cached_modules WHERE 1=1"
     params = []
     if language:
         sql += " AND LOWER(language) LIKE LOWER(?)"
@@ -123,23 +229,38 @@ def _cache_list(language=None, module_type=None):
     if module_type:
         sql += " AND LOWER(module_type) LIKE LOWER(?)"
         params.append(f"%{module_type}%")
-    sql += " GROUP BY LOWER(name) ORDER BY LOWER(name)"
+    sql += " GROUP BY name COLLATE NOCASE ORDER BY name COLLATE NOCASE"
     with _cache_conn() as conn:
         return [dict(r) for r in conn.execute(sql, params).fetchall()]
 
-def _cache_versions(name):
+def _cache_versions(names):
+    """Returns {lowercased name: [update_date, ...] newest first} for the given names."""
+    versions = {}
     with _cache_conn() as conn:
-        return conn.execute(
-            "SELECT DISTINCT update_date FROM cached_modules "
-            "WHERE LOWER(name) LIKE LOWER(?) ORDER BY update_date DESC",
-            [name],
-        ).fetchall()
+        for placeholders, batch in _in_batches(names):
+            # Plain tuples are enough here; skip building sqlite3.Row objects
+            cur = conn.cursor()
+            cur.row_factory = None
+            for name, date in cur.execute(
+                "SELECT name, update_date FROM cached_modules "
+                f"WHERE name COLLATE NOCASE IN ({placeholders}) "
+                "ORDER BY name COLLATE NOCASE, update_date DESC",
+                batch,
+            ):
+                dates = versions.setdefault(name.lower(), [])
+                # The same date may come from several sources; rows arrive in
+                # (name, date) order, so such repeats are adjacent
+                if not dates or dates[-1] != date:
+                    dates.append(date)
+    return versions
 
 # ---------------------------------------------------------------------------
 # Installed DB  (<module_path>/mybible_installed.db)
 # Schema identical to mybible-cli-java:
 #   installed_modules(name PK, language, description, type, updatedate, installdate)
 #   installed_files(id PK AUTOINCREMENT, module_name FK, file_name, file_path)
+# plus a table local to mybible-get, leaving the shared ones untouched:
+#   module_hashes(module_name PK FK, content_hash)  — sha256 of the installed archive
 # ---------------------------------------------------------------------------
 
 def _installed_db_path():
@@ -150,11 +271,26 @@ def _inst_conn():
     p = _installed_db_path()
     if p is None:
         raise RuntimeError("Module path not set. Use 'set-path' first.")
-    conn = sqlite3.connect(str(p))
+    return _open_inst_db(str(p))
+
+@lru_cache(maxsize=None)
+def _open_inst_db(path):
+    conn = sqlite3.connect(path)
     conn.row_factory = sqlite3.Row
+    # No WAL here: the module folder is shared with other MyBible tools and is
+    # often synced or on a network share, where -wal/-shm files are unsafe.
+    # Default synchronous stays too, since this DB cannot be rebuilt.
     conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -64000")
+    conn.execute("PRAGMA mmap_size = 268435456")
     return conn
 
+def _attach_cache(conn):
+    """Attaches the cache DB as 'cache' to an installed-DB connection, once."""
+    if not any(row[1] == "cache" for row in conn.execute("PRAGMA database_list")):
+        conn.execute("ATTACH DATABASE ? AS cache", [str(CACHE_DB_PATH)])
+
 def ensure_installed_db():
     if _installed_db_path() is None:
         return
@@ -175,7 +311,13 @@ def ensure_installed_db():
                 file_path   TEXT NOT NULL,
                 FOREIGN KEY (module_name) REFERENCES installed_modules(name) ON DELETE CASCADE
             );
+            CREATE TABLE IF NOT EXISTS module_hashes (
+                module_name  TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                FOREIGN KEY (module_name) REFERENCES installed_modules(name) ON DELETE CASCADE
+            );
             CREATE INDEX IF NOT EXISTS idx_installed_module ON installed_files(module_name);
+            CREATE INDEX IF NOT EXISTS idx_installed_name_nocase ON installed_modules(name COLLATE NOCASE);
         """)
         # Migration: silently add 'type' column to databases created before this schema
         try:
@@ -187,7 +329,7 @@ def _inst_get(name):
     """Returns (mod_dict, [file_dicts]) or None."""
     with _inst_conn() as conn:
         row = conn.execute(
-            "SELECT * FROM installed_modules WHERE LOWER(name) LIKE LOWER(?)", [name]
+            "SELECT * FROM installed_modules WHERE name = ? COLLATE NOCASE", [name]
         ).fetchone()
         if row is None:
             return None
@@ -197,31 +339,46 @@ def _inst_get(name):
         ).fetchall()
         return dict(row), [dict(f) for f in files]
 
-def _inst_list(language=None, module_type=None):
-    """Returns list of (mod_dict, [file_dicts])."""
-    sql = "SELECT * FROM installed_modules WHERE 1=1"
+def _inst_filters(language=None, module_type=None):
+    """Returns (where_clause, params) filtering installed_modules aliased as 'm'."""
+    where = "WHERE 1=1"
     params = []
     if language:
-        sql += " AND LOWER(language) LIKE LOWER(?)"
+        where += " AND LOWER(m.language) LIKE LOWER(?)"
         params.append(f"%{language}%")
     if module_type:
-        sql += " AND LOWER(type) LIKE LOWER(?)"
+        where += " AND LOWER(m.type) LIKE LOWER(?)"
         params.append(f"%{module_type}%")
-    sql += " ORDER BY LOWER(name)"
+    return where, params
+
+def _inst_versions(names):
+    """Returns {lowercased name: installed update date} for those of names that are installed."""
+    with _inst_conn() as conn:
+        return {
+            row[0].lower(): row[1]
+            for placeholders, batch in _in_batches(names)
+            for row in conn.execute(
+                "SELECT name, updatedate FROM installed_modules "
+                f"WHERE name COLLATE NOCASE IN ({placeholders})",
+                batch,
+            )
+        }
+
+def _inst_list_counts(language=None, module_type=None):
+    """Returns installed module dicts with a 'file_count' key, in one query."""
+    where, params = _inst_filters(language, module_type)
+    sql = (
+        "SELECT m.*, COALESCE(f.file_count, 0) AS file_count FROM installed_modules m "
+        "LEFT JOIN (SELECT module_name, COUNT(*) AS file_count FROM installed_files "
+        "GROUP BY module_name) f ON f.module_name = m.name "
+        f"{where} ORDER BY m.name COLLATE NOCASE"
+    )
     with _inst_conn() as conn:
-        rows = conn.execute(sql, params).fetchall()
-        result = []
-        for row in rows:
-            files = conn.execute(
-                "SELECT file_name, file_path FROM installed_files WHERE module_name = ?",
-                [row["name"]],
-            ).fetchall()
-            result.append((dict(row), [dict(f) for f in files]))
-        return result
+        return [dict(r) for r in conn.execute(sql, params).fetchall()]
 
 def _inst_insert(mod_row, files_dict):
     """
-    mod_row: dict with keys name/language/description/type/updatedate/installdate
+    mod_row: dict with keys name/language/description/type/updatedate/installdate/content_hash
     files_dict: {file_name: file_path_str, ...}
     """
     with _inst_conn() as conn:
@@ -231,15 +388,85 @@ def _inst_insert(mod_row, files_dict):
             "VALUES (:name,:language,:description,:type,:updatedate,:installdate)",
             mod_row,
         )
+        conn.execute(
+            "INSERT OR REPLACE INTO module_hashes (module_name, content_hash) VALUES (?,?)",
+            [mod_row["name"], mod_row["content_hash"]],
+        )
         conn.executemany(
             "INSERT INTO installed_files (module_name,file_name,file_path) VALUES (?,?,?)",
             [(mod_row["name"], fname, fpath) for fname, fpath in files_dict.items()],
         )
 
-def _inst_delete(name):
+def _inst_content_hash(name):
+    """Returns the recorded archive hash of an installed module, or None."""
+    with _inst_conn() as conn:
+        row = conn.execute(
+            "SELECT content_hash FROM module_hashes WHERE module_name = ?", [name]
+        ).fetchone()
+        return row["content_hash"] if row else None
+
+def _inst_is_empty():
     with _inst_conn() as conn:
-        conn.execute("DELETE FROM installed_files WHERE module_name = ?", [name])
-        conn.execute("DELETE FROM installed_modules WHERE name = ?", [name])
+        return conn.execute("SELECT COUNT(*) FROM installed_modules").fetchone()[0] == 0
+
+def _inst_upgradable(language=None, module_type=None):
+    """
+    Returns installed modules that have a newer version in the cache,
+    computed in one query with the cache DB attached.
+    """
+    sql = (
+        "SELECT i.name, i.updatedate, i.description, MAX(c.update_date) AS latest_date "
+        "FROM installed_modules i "
+        "JOIN cache.cached_modules c ON c.name = i.name COLLATE NOCASE WHERE 1=1"
+    )
+    params = []
+    if language:
+        sql += " AND LOWER(i.language) LIKE LOWER(?)"
+        params.append(f"%{language}%")
+    if module_type:
+        sql += " AND LOWER(i.type) = LOWER(?)"
+        params.append(module_type)
+    sql += " GROUP BY i.name HAVING MAX(c.update_date) > i.updatedate ORDER BY i.name COLLATE NOCASE"
+    with _inst_conn() as conn:
+        _attach_cache(conn)
+        return [dict(r) for r in conn.execute(sql, params).fetchall()]
+
+def _inst_upgrade_status(names):
+    """
+    Returns {lowercased name: (installed name, in_cache, outdated)} for those
+    of names that are installed; both flags are computed by SQLite from
+    indexed EXISTS probes into the attached cache.
+    """
+    with _inst_conn() as conn:
+        _attach_cache(conn)
+        return {
+            row[0].lower(): (row[0], bool(row[1]), bool(row[2]))
+            for placeholders, batch in _in_batches(names)
+            for row in conn.execute(
+                "SELECT i.name, "
+                "EXISTS(SELECT 1 FROM cache.cached_modules c "
+                "       WHERE c.name = i.name COLLATE NOCASE), "
+                "EXISTS(SELECT 1 FROM cache.cached_modules c "
+                "       WHERE c.name = i.name COLLATE NOCASE AND c.update_date > i.updatedate) "
+                f"FROM installed_modules i WHERE i.name COLLATE NOCASE IN ({placeholders})",
+                batch,
+            )
+        }
+
+def _inst_touch(name, updatedate, installdate):
+    with _inst_conn() as conn:
+        conn.execute(
+            "UPDATE installed_modules SET updatedate = ?, installdate = ? WHERE name = ?",
+            [updatedate, installdate, name],
+        )
+
+def _inst_delete(names):
+    """Deletes the given modules and their file records in a single transaction."""
+    with _inst_conn() as conn:
+        for placeholders, batch in _in_batches(names):
+            conn.execute(f"DELETE FROM installed_files WHERE module_name IN ({placeholders})", batch)
+            conn.execute(f"DELETE FROM module_hashes WHERE module_name IN ({placeholders})", batch)
+            conn.execute(f"DELETE FROM installed_modules WHERE name IN ({placeholders})", batch)
 
 # ---------------------------------------------------------------------------
 # CLI decorator
@@ -266,6 +493,104 @@ def process_module_names(names_tuple):
         processed.extend(p for p in parts if p)
     return processed
 
+def _name_keys(names):
+    """
+    Maps each name's lowercased form to its first spelling as given, so
+    case-insensitive lookups normalize once and repeats collapse in order.
+    """
+    keys = {}
+    for name in names:
+        keys.setdefault(name.lower(), name)
+    return keys
+
+def _native_rm(path):
+    """Returns an 'rm -rf' command line for path, or None where rm is unavailable."""
+    if sys.platform != 'win32' and shutil.which('rm'):
+        return ['rm', '-rf', '--', str(path)]
+    return None
+
+def _fast_rmtree(path):
+    """Removes a directory tree, preferring native 'rm -rf' for large caches."""
+    cmd = _native_rm(path)
+    if cmd:
+        subprocess.run(cmd, check=True)
+    else:
+        shutil.rmtree(path, ignore_errors=True)
+
+def _rm_marker(path):
+    """Marker next to a trash directory holding the PID of the process deleting it."""
+    return path.with_name(path.name + '.pid')
+
+def _pid_alive(pid):
+    if sys.platform == 'win32':
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x00100000, False, pid)  # SYNCHRONIZE
+        if not handle:
+            return False
+        try:
+            return kernel32.WaitForSingleObject(handle, 0) == 0x102  # WAIT_TIMEOUT
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def _spawn_rmtree(path):
+    """Deletes a directory tree in a detached process that outlives this one."""
+    cmd = _native_rm(path) or [
+        sys.executable, '-c',
+        'import shutil, sys; shutil.rmtree(sys.argv[1], ignore_errors=True)', str(path),
+    ]
+    proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL, start_new_session=True)
+    # Lets later sweeps tell a tree still being deleted from an abandoned one
+    try:
+        _rm_marker(path).write_text(str(proc.pid))
+    except OSError:
+        pass
+
+def _trash_dir(path):
+    """
+    Renames a directory aside (atomic on the same filesystem) and deletes it
+    in the background, so the caller does not wait for the unlinks.
+    A missing directory is not an error.
+    """
+    trash = path.with_name(f"{path.name}.trash-{uuid.uuid4().hex}")
+    try:
+        path.rename(trash)
+    except FileNotFoundError:
+        return
+    except OSError:
+        _fast_rmtree(path)
+        return
+    _spawn_rmtree(trash)
+
+def _sweep_trash():
+    """
+    Restarts deletion of trash directories left by an interrupted purge.
+    Trees whose recorded deleting process is still running are left alone,
+    and markers of finished deletions are cleaned up.
+    """
+    for target in (CONFIG_DIR, CACHE_DIR):
+        if not target.parent.is_dir():
+            continue
+        for leftover in target.parent.glob(f"{target.name}.trash-*"):
+            if leftover.suffix == '.pid':
+                if not leftover.with_suffix('').exists():
+                    leftover.unlink(missing_ok=True)
+                continue
+            try:
+                if _pid_alive(int(_rm_marker(leftover).read_text())):
+                    continue
+            except (OSError, ValueError):
+                pass  # no usable marker: nothing is deleting it
+            _spawn_rmtree(leftover)
+
 def ensure_dirs():
     CONFIG_DIR.mkdir(parents=True, exist_ok=True)
     SOURCES_DIR.mkdir(parents=True, exist_ok=True)
@@ -275,6 +600,7 @@ def ensure_dirs():
     if not any(SOURCES_DIR.iterdir()):
         init_sources()
 
+@lru_cache(maxsize=1)
 def get_config():
     if not CONFIG_FILE_PATH.exists():
         return {}
@@ -287,19 +613,7 @@ def get_config():
 def save_config(config):
     with open(CONFIG_FILE_PATH, 'w', encoding='utf-8') as f:
         json.dump(config, f, indent=2)
-
-def get_etag_cache():
-    if not ETAG_CACHE_PATH.exists():
-        return {}
-    try:
-        with open(ETAG_CACHE_PATH, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except json.JSONDecodeError:
-        return {}
-
-def save_etag_cache(etag_cache):
-    with open(ETAG_CACHE_PATH, 'w', encoding='utf-8') as f:
-        json.dump(etag_cache, f, indent=2)
+    get_config.cache_clear()
 
 def init_sources(force=False):
     for filename, url in DEFAULT_SOURCES.items():
@@ -313,10 +627,123 @@ def init_sources(force=False):
 def get_module_path():
     return get_config().get("module_path")
 
+# ---------------------------------------------------------------------------
+# Zip helpers
+# ---------------------------------------------------------------------------
+
+ZIP_CHUNK_SIZE = 1 << 20
+
+class _ArchiveMap(mmap.mmap):
+    # zipfile checks seekable(), which mmap only gained in Python 3.13
+    def seekable(self):
+        return True
+
+@contextmanager
+def _open_zip(zip_path):
+    """
+    Opens a zip archive over a read-only memory map of the file, so member
+    reads are served from the page cache without read() syscalls.
+    """
+    with open(zip_path, 'rb') as fd:
+        try:
+            mm = _ArchiveMap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            raise zipfile.BadZipFile(f"{zip_path} is empty")
+        with mm, zipfile.ZipFile(mm) as zf:
+            yield zf
+
+def _iter_zip_member(zf, info):
+    """
+    Yields the decompressed data of a zip member in chunks.
+    Deflated members are inflated with ISA-L/zlib-ng when available,
+    everything else goes through the stdlib zipfile reader.
+    """
+    if _fast_zlib is None or info.compress_type != zipfile.ZIP_DEFLATED or info.flag_bits & 0x1:
+        with zf.open(info) as src:
+            yield from iter(lambda: src.read(ZIP_CHUNK_SIZE), b'')
+        return
+    fp = zf.fp
+    fp.seek(info.header_offset)
+    header = fp.read(30)
+    if header[:4] != b'PK\x03\x04':
+        raise zipfile.BadZipFile(f"Bad local file header for {info.filename!r}")
+    name_len, extra_len = struct.unpack('<HH', header[26:30])
+    fp.seek(info.header_offset + 30 + name_len + extra_len)
+    inflater = _fast_zlib.decompressobj(-zlib.MAX_WBITS)
+    remaining = info.compress_size
+    crc = 0
+    while remaining > 0:
+        block = fp.read(min(ZIP_CHUNK_SIZE, remaining))
+        if not block:
+            raise zipfile.BadZipFile(f"Truncated data for {info.filename!r}")
+        remaining -= len(block)
+        chunk = inflater.decompress(block)
+        crc = zlib.crc32(chunk, crc)
+        yield chunk
+    tail = inflater.flush()
+    crc = zlib.crc32(tail, crc)
+    yield tail
+    if crc != info.CRC:
+        raise zipfile.BadZipFile(f"Bad CRC-32 for file {info.filename!r}")
+
+def _read_zip_member(zf, info):
+    return b''.join(_iter_zip_member(zf, info))
+
+def _extract_zip_member(zf, info, target_path):
+    """Writes a zip member straight to target_path (already renamed)."""
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(target_path, 'wb') as dst:
+        for chunk in _iter_zip_member(zf, info):
+            dst.write(chunk)
+
+def _extract_zip_members(zip_path, jobs):
+    """
+    Extracts (ZipInfo, target_path) pairs, one archive member per worker thread.
+    Each worker opens its own ZipFile: a shared instance is not safe for
+    concurrent reads.
+    """
+    def extract_one(job):
+        with _open_zip(zip_path) as z:
+            _extract_zip_member(z, *job)
+
+    if len(jobs) <= 1:
+        for job in jobs:
+            extract_one(job)
+        return
+    with ThreadPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as ex:
+        list(ex.map(extract_one, jobs))
+
 # ---------------------------------------------------------------------------
 # Registry parsers
 # ---------------------------------------------------------------------------
 
+def _url_filename(download_url):
+    """Unquoted last path component of a download URL."""
+    return urllib.parse.unquote(download_url.rsplit('/', 1)[-1])
+
+@lru_cache(maxsize=4096)
+def _url_module_type(download_url):
+    """Module type from the URL file name: 'KJV.commentaries.zip' -> 'commentaries'."""
+    parts = _url_filename(download_url).removesuffix('.zip').rsplit('.', 1)
+    return parts[-1] if len(parts) > 1 else 'bible'
+
+def load_zipped_registry(raw):
+    """
+    Returns the registry JSON as a mapping for parse_zipped_registry.
+    orjson decodes the whole document fastest. Without it, but with ijson,
+    'downloads' is streamed lazily instead of being built as one big list,
+    and only the small 'hosts' array is materialized.
+    """
+    if ijson is None or json_loads is not json.loads:
+        return json_loads(raw)
+    # Stop the hosts pass where the array closes instead of reading the whole document
+    events = ijson.parse(io.BytesIO(raw), use_float=True)
+    hosts_events = takewhile(lambda event: event[:2] != ('hosts', 'end_array'), events)
+    return {
+        "hosts": list(ijson.items(hosts_events, 'hosts.item')),
+        "downloads": ijson.items(io.BytesIO(raw), 'downloads.item', use_float=True),
+    }
+
 def parse_extra_registry(data, registry_url):
     for mod in data.get("modules", []):
         if not all(k in mod for k in ['download_url', 'file_name', 'description', 'update_date']):
@@ -325,9 +752,7 @@ def parse_extra_registry(data, registry_url):
         if module_name.endswith('.zip'):
             module_name = module_name[:-4]
         download_url = mod["download_url"]
-        url_filename = urllib.parse.unquote(download_url.split('/')[-1]).removesuffix('.zip')
-        parts = url_filename.split('.')
-        module_type = parts[-1] if len(parts) > 1 else 'bible'
+        module_type = _url_module_type(download_url)
         yield {
             "name": module_name, "language": mod.get("language_code"),
             "description": mod["description"], "update_date": mod["update_date"],
@@ -354,9 +779,7 @@ def parse_zipped_registry(data, registry_url):
             if not (mod.get('des') and mod.get('upd')):
                 continue
             download_url = hosts[alias].replace("%s", file_part)
-            url_filename = urllib.parse.unquote(download_url.split('/')[-1]).removesuffix('.zip')
-            parts = url_filename.split('.')
-            module_type = parts[-1] if len(parts) > 1 else 'bible'
+            module_type = _url_module_type(download_url)
             yield {
                 "name": name, "language": mod.get('lng'), "description": mod.get('des'),
                 "update_date": mod.get('upd'), "download_url": download_url,
@@ -368,56 +791,140 @@ def parse_zipped_registry(data, registry_url):
 # Cache update
 # ---------------------------------------------------------------------------
 
+REGISTRY_FETCH_WORKERS = 8
+
+def _read_registry_json(content):
+    """Returns the raw JSON document of a zipped registry."""
+    with zipfile.ZipFile(io.BytesIO(content)) as zf:
+        json_info = next((i for i in zf.infolist() if i.filename.endswith('.json')), None)
+        if json_info is None:
+            raise zipfile.BadZipFile("no JSON file in registry archive")
+        return _read_zip_member(zf, json_info)
+
+def _strip_bom(raw):
+    # stdlib json.loads(bytes) accepts a UTF-8 BOM; orjson and ijson reject it
+    return raw[len(codecs.BOM_UTF8):] if raw.startswith(codecs.BOM_UTF8) else raw
+
+def _decode_registry(source_file, content):
+    if source_file.suffix == ".registry":
+        return load_zipped_registry(_strip_bom(_read_registry_json(content)))
+    return json_loads(_strip_bom(content))
+
+def _cached_copy_is_current(response, cached_reg_path):
+    """True if a HEAD response matches the cached file by size and modification time."""
+    try:
+        size = int(response.headers['Content-Length'])
+        modified = parsedate_to_datetime(response.headers['Last-Modified'])
+        stat = cached_reg_path.stat()
+        # A '-0000' zone parses to a naive datetime, which cannot be compared
+        # with the aware mtime (TypeError); such a response counts as changed
+        return size == stat.st_size and modified <= datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
+    except (KeyError, TypeError, ValueError, OSError):
+        return False
+
+def _fetch_registry(source_file, url, validators, have_rows=False):
+    """
+    Downloads and decodes one registry (runs in a worker thread).
+    Returns (data, new_validators); new_validators is None when the
+    cached copy was used (304, or a HEAD probe showed it is unchanged).
+    If the registry is unchanged and its rows are already in the cache
+    (have_rows), data is None and nothing is decoded.
+    """
+    cached_reg_path = REGISTRY_CACHE_DIR / source_file.name
+    headers = {'User-Agent': 'mybible-get/1.0'}
+    if not cached_reg_path.exists():
+        validators = {}
+    if validators.get("etag"):
+        headers['If-None-Match'] = validators["etag"]
+    if validators.get("last_modified"):
+        headers['If-Modified-Since'] = validators["last_modified"]
+
+    # A cached copy with no source_meta row (e.g. the cache DB was rebuilt)
+    # cannot be revalidated with a conditional GET; a HEAD probe may still
+    # avoid the transfer. Sources known to send no validators are not probed:
+    # their HEAD responses carry nothing to compare either.
+    if cached_reg_path.exists() and not validators:
+        from requests import RequestException
+        try:
+            head = get_http_session().head(url, timeout=10, headers=headers, allow_redirects=True)
+        except RequestException:
+            head = None  # a failed probe just falls through to the GET
+        if head is not None and head.ok and _cached_copy_is_current(head, cached_reg_path):
+            if have_rows:
+                return None, None
+            return _decode_registry(source_file, cached_reg_path.read_bytes()), None
+
+    response = get_http_session().get(url, timeout=20, headers=headers)
+    if response.status_code == 304:
+        if have_rows:
+            return None, None
+        content = cached_reg_path.read_bytes()
+        new_validators = None
+    else:
+        response.raise_for_status()
+        content = response.content
+        cached_reg_path.write_bytes(content)
+        new_validators = {
+            key: response.headers[header]
+            for key, header in (("etag", "ETag"), ("last_modified", "Last-Modified"))
+            if header in response.headers
+        }
+    return _decode_registry(source_file, content), new_validators
+
 def update_cache():
+    from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TimeElapsedColumn
     ensure_dirs()
     ensure_cache_db()
-    etag_cache = get_etag_cache()
-
-    with _cache_conn() as conn:
-        conn.execute("DELETE FROM cached_modules")
+    validators = _cache_get_validators()
 
-    session = requests.Session()
     source_files = (
         list(SOURCES_DIR.glob("*.registry")) + list(SOURCES_DIR.glob("*.extra"))
     )
+    source_urls = {f: f.read_text(encoding='utf-8').strip() for f in source_files}
+
+    # Rows are refreshed per source; only those of removed sources are dropped up front
+    conn = _cache_conn()
+    with conn:
+        cached_sources = {
+            r[0] for r in conn.execute("SELECT DISTINCT source_registry FROM cached_modules")
+        }
+        for url in cached_sources - set(source_urls.values()):
+            conn.execute("DELETE FROM cached_modules WHERE source_registry = ?", [url])
+            conn.execute("DELETE FROM source_meta WHERE url = ?", [url])
 
     with Progress(
         SpinnerColumn(), TextColumn("{task.description}"), BarColumn(),
         "[progress.percentage]{task.percentage:>3.0f}%", TimeElapsedColumn(),
         console=console,
-    ) as progress:
+    ) as progress, ThreadPoolExecutor(max_workers=REGISTRY_FETCH_WORKERS) as ex:
         task = progress.add_task("[green]Processing sources...", total=len(source_files))
-        for source_file in source_files:
+        futures = {}
+        for source_file, url in source_urls.items():
+            future = ex.submit(_fetch_registry, source_file, url,
+                               validators.get(url, {}), url in cached_sources)
+            futures[future] = (source_file, url)
+
+        # Network I/O overlaps in the pool; SQLite writes stay on this thread
+        for future in as_completed(futures):
+            source_file, url = futures[future]
             progress.update(task, advance=1, description=f"[cyan]Processing {source_file.name}")
-            url = source_file.read_text(encoding='utf-8').strip()
-            cached_reg_path = REGISTRY_CACHE_DIR / source_file.name
-            headers = {'User-Agent': 'mybible-get/1.0'}
-            if url in etag_cache and cached_reg_path.exists():
-                headers['If-None-Match'] = etag_cache[url]
             try:
-                response = session.get(url, timeout=20, headers=headers)
-                if response.status_code == 304:
-                    content = cached_reg_path.read_bytes()
-                else:
-                    response.raise_for_status()
-                    content = response.content
-                    cached_reg_path.write_bytes(content)
-                    if 'ETag' in response.headers:
-                        etag_cache[url] = response.headers['ETag']
+                data, new_validators = future.result()
+                if data is None:
+                    continue  # unchanged since the last update, rows are current
                 if source_file.suffix == ".registry":
-                    zf = zipfile.ZipFile(io.BytesIO(content))
-                    json_name = next(n for n in zf.namelist() if n.endswith('.json'))
-                    data = json.loads(zf.read(json_name))
-                    modules_to_add = list(parse_zipped_registry(data, url))
+                    modules = parse_zipped_registry(data, url)
                 else:
-                    data = json.loads(content)
-                    modules_to_add = list(parse_extra_registry(data, url))
-                if modules_to_add:
-                    _cache_insert_many(modules_to_add)
+                    modules = parse_extra_registry(data, url)
+                # One transaction per source: a registry failing mid-stream keeps its old rows
+                with conn:
+                    conn.execute("DELETE FROM cached_modules WHERE source_registry = ?", [url])
+                    _cache_insert_many(conn, modules)
+                    if new_validators is not None:
+                        _cache_save_validators(conn, url, new_validators)
             except Exception as e:
                 console.log(f"[yellow]Failed to process {url}: {type(e).__name__} - {e}[/yellow]")
 
-    save_etag_cache(etag_cache)
     console.print("[bold green]Cache update complete.[/bold green]")
 
 # ---------------------------------------------------------------------------
@@ -425,12 +932,15 @@ def update_cache():
 # ---------------------------------------------------------------------------
 
 def render_clean_list(results, title, page=False, is_upgradable=False):
+    from rich.console import Group
+    from rich.rule import Rule
+    from rich.text import Text
     if not results:
         console.print("[yellow]No modules found for the given criteria.[/yellow]")
         return
 
     def generate_output():
-        yield f"[bold green]{title}[/bold green]\n"
+        yield Text.from_markup(f"[bold green]{title}[/bold green]\n")
         for i, item in enumerate(results):
             text = Text()
             if is_upgradable:
@@ -444,20 +954,19 @@ def render_clean_list(results, title, page=False, is_upgradable=False):
                 text.append("\nDescription: ", style="bold magenta"); text.append(item["description"])
                 version_key = "update_date" if "update_date" in item else "updatedate"
                 text.append("\nVersion: ", style="bold magenta"); text.append(item[version_key], style="green")
-                if "files" in item:
-                    text.append("\nFiles: ", style="bold magenta"); text.append(str(len(item["files"])), style="white")
+                if "file_count" in item:
+                    text.append("\nFiles: ", style="bold magenta"); text.append(str(item["file_count"]), style="white")
             yield text
-            if i < len(results) - 1:
-                yield Rule(style="dim blue")
-            else:
-                yield ""
+            yield Rule(style="dim blue") if i < len(results) - 1 else Text()
 
+    # Per-module renderables printed as one Group: a single print call and
+    # flush, without a table measuring every cell to size its columns
+    output = Group(*generate_output())
     if page:
         with console.pager(styles=True):
-            console.print(*list(generate_output()))
+            console.print(output)
     else:
-        for item in generate_output():
-            console.print(item)
+        console.print(output)
 
 # ---------------------------------------------------------------------------
 # CLI
@@ -466,6 +975,7 @@ def render_clean_list(results, title, page=False, is_upgradable=False):
 @click.group(context_settings=dict(help_option_names=['-h', '--help']))
 def cli():
     """A command-line tool to manage MyBible modules."""
+    _sweep_trash()
     ensure_dirs()
 
 @cli.command("set-path", help="Set the path where modules will be installed.")
@@ -506,11 +1016,7 @@ def list_modules(available, installed, upgradable, language, module_type, page):
         render_clean_list(rows, title, page)
 
     if installed and not upgradable:
-        pairs = _inst_list(language, module_type)
-        results = []
-        for mod_row, files in pairs:
-            mod_row["files"] = files
-            results.append(mod_row)
+        results = _inst_list_counts(language, module_type)
         filters = []
         if language: filters.append(f"Language: {language}")
         if module_type: filters.append(f"Type: {module_type}")
@@ -518,24 +1024,11 @@ def list_modules(available, installed, upgradable, language, module_type, page):
         render_clean_list(results, title, page)
 
     if upgradable:
-        pairs = _inst_list(language)
-        if not pairs:
+        if _inst_is_empty():
             console.print("[yellow]No modules installed, nothing to upgrade.[/yellow]"); return
         if is_cache_empty():
             console.print("[yellow]Cache is empty. Run 'update' to check for upgrades.[/yellow]"); return
-        upgradable_list = []
-        for mod_row, _ in pairs:
-            if module_type and mod_row.get("type", "bible").lower() != module_type.lower():
-                continue
-            latest = _cache_get_module(mod_row["name"])
-            if not latest or latest["update_date"] <= mod_row["updatedate"]:
-                continue
-            upgradable_list.append({
-                "name": mod_row["name"],
-                "updatedate": mod_row["updatedate"],
-                "latest_date": latest["update_date"],
-                "description": mod_row["description"],
-            })
+        upgradable_list = _inst_upgradable(language, module_type)
         filters = []
         if language: filters.append(f"Language: {language}")
         if module_type: filters.append(f"Type: {module_type}")
@@ -576,7 +1069,7 @@ def search(search_term, search_name, search_desc, search_lang, search_type, page
         params.extend([f"%{search_term}%"] * 4)
 
     sql = ("SELECT * FROM cached_modules WHERE " + " AND ".join(where_parts)
-           + " GROUP BY LOWER(name) ORDER BY LOWER(name)")
+           + " GROUP BY name COLLATE NOCASE ORDER BY name COLLATE NOCASE")
     with _cache_conn() as conn:
         rows = [dict(r) for r in conn.execute(sql, params).fetchall()]
 
@@ -593,6 +1086,8 @@ def info(name):
     if not cached:
         console.print(f"[red]Module '{name}' not found.[/red]"); return
     cached = dict(cached)
+    from rich.box import ROUNDED
+    from rich.panel import Panel
 
     content_str = ""
     for k, v in cached.items():
@@ -621,69 +1116,138 @@ def info(name):
 # Install / remove helpers
 # ---------------------------------------------------------------------------
 
+_MODULE_TYPE_RE = re.compile(
+    r"\.(commentaries|cross-references|crossreferences|devotions|dictionaries[_-]lookup"
+    r"|dictionary|plan|referencedata|subheadings)\.",
+    re.IGNORECASE,
+)
+
 def _reconstruct_sqlite_name(original_filename, module_name_from_json):
     if not original_filename.lower().endswith('.sqlite3'):
         return original_filename
-    module_types = [
-        "commentaries", "cross-references", "crossreferences", "devotions",
-        "dictionaries_lookup", "dictionaries-lookup", "dictionary",
-        "plan", "referencedata", "subheadings",
-    ]
-    lower_fn = original_filename.lower()
-    for mod_type in module_types:
-        if f".{mod_type.lower()}." in lower_fn:
-            return f"{module_name_from_json}.{mod_type}.SQLite3"
+    match = _MODULE_TYPE_RE.search(original_filename)
+    if match:
+        return f"{module_name_from_json}.{match.group(1).lower()}.SQLite3"
     return f"{module_name_from_json}.SQLite3"
 
-def install_single_module(name, version=None):
-    """Download, extract and record a single module. Returns True on success."""
+def _file_sha256(path):
+    with open(path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        h = hashlib.sha256()
+        for block in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b''):
+            h.update(block)
+        return h.hexdigest()
+
+def _module_zip_path(mod):
+    url_filename = _url_filename(mod["download_url"])
+    if not url_filename.endswith('.zip'):
+        url_filename += '.zip'
+    return DOWNLOAD_CACHE_DIR / url_filename
+
+def _download_progress():
+    from rich.progress import Progress, BarColumn, TextColumn
+    return Progress(
+        TextColumn("[blue]{task.fields[filename]}"),
+        BarColumn(), "[progress.percentage]{task.percentage:>3.1f}%",
+        console=console,
+    )
+
+def _download_module(mod, progress):
+    """
+    Fetches a module archive into the download cache, reporting on its own
+    task of a shared Progress. Safe to run from worker threads.
+    Returns True on success.
+    """
+    from requests import RequestException
+    zip_path = _module_zip_path(mod)
+    # Download to a side file so an interrupted transfer never lands in the cache
+    part_path = zip_path.with_name(zip_path.name + '.part')
+    task = progress.add_task("Downloading", total=None, filename=mod["file_name"])
+    try:
+        with get_http_session().get(mod["download_url"], stream=True, timeout=30) as r:
+            r.raise_for_status()
+            expected = int(r.headers.get('content-length', 0))
+            progress.update(task, total=expected or None)
+            with open(part_path, 'wb') as f:
+                for chunk in r.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk); progress.update(task, advance=len(chunk))
+            if expected and r.raw.tell() != expected:
+                raise RequestException(
+                    f"incomplete download ({r.raw.tell()} of {expected} bytes)"
+                )
+        part_path.replace(zip_path)
+        return True
+    except RequestException as e:
+        part_path.unlink(missing_ok=True)
+        console.print(f"[red]Download failed for '{mod['name']}': {e}[/red]")
+        return False
+
+def install_single_module(name, version=None, replace=False):
+    """
+    Download, extract and record a single module. Returns True on success.
+    With replace=True an installed copy is swapped out only after the new
+    archive is available; if its content hash matches the installed one,
+    extraction is skipped and only the version/install dates are updated.
+    """
     mod = _cache_get_module(name, version)
     if not mod:
         console.print(f"[red]Module '{name}' not found in cache.[/red]")
         return False
     mod = dict(mod)
 
-    url_filename = urllib.parse.unquote(mod["download_url"].split('/')[-1])
-    if not url_filename.endswith('.zip'):
-        url_filename += '.zip'
-    zip_path = DOWNLOAD_CACHE_DIR / url_filename
-
+    zip_path = _module_zip_path(mod)
     if not zip_path.exists():
-        try:
-            with Progress(
-                TextColumn("[blue]{task.fields[filename]}"),
-                BarColumn(), "[progress.percentage]{task.percentage:>3.1f}%",
-                console=console,
-            ) as p:
-                task = p.add_task("Downloading", total=None, filename=mod["file_name"])
-                with requests.get(mod["download_url"], stream=True, timeout=30) as r:
-                    r.raise_for_status()
-                    p.update(task, total=int(r.headers.get('content-length', 0)))
-                    with open(zip_path, 'wb') as f:
-                        for chunk in r.iter_content(8192):
-                            f.write(chunk); p.update(task, advance=len(chunk))
-        except requests.RequestException as e:
-            console.print(f"[red]Download failed for '{name}': {e}[/red]"); return False
+        with _download_progress() as progress:
+            if not _download_module(mod, progress):
+                return False
+
+    content_hash = _file_sha256(zip_path)
+    installdate = datetime.now(timezone.utc).isoformat()
+    if replace:
+        inst = _inst_get(mod["name"])
+        if inst:
+            inst_row, inst_files = inst
+            if _inst_content_hash(inst_row["name"]) == content_hash and all(
+                Path(f["file_path"]).exists() for f in inst_files
+            ):
+                _inst_touch(inst_row["name"], mod["update_date"], installdate)
+                console.print(
+                    f"[bold green]{mod['name']} v{mod['update_date']} is unchanged, "
+                    "version recorded without re-extracting[/bold green]"
+                )
+                return True
+            if not remove_module(inst_row["name"], quiet=True):
+                console.print(f"[red]Failed to remove old version of '{name}', skipping.[/red]")
+                return False
 
     final_files = {}
-    module_path = get_module_path()
+    module_path = Path(get_module_path())
+    module_root = module_path.resolve()
     clean_module_name = mod["name"].removesuffix('.zip')
 
-    with console.status(f"[bold green]Extracting {mod['file_name']}..."), \
-         zipfile.ZipFile(zip_path) as z:
-        for member in z.infolist():
-            if member.is_dir():
-                continue
-            orig = member.filename
-            target_name = _reconstruct_sqlite_name(orig, clean_module_name)
-            if target_name == orig and orig.startswith('.'):
-                target_name = clean_module_name + orig
-            z.extract(member, module_path)
-            extracted_path = Path(module_path) / orig
-            target_path = Path(module_path) / target_name
-            if target_name != orig and extracted_path.exists():
-                extracted_path.rename(target_path)
-            final_files[target_name] = str(target_path)
+    jobs = {}
+    try:
+        with console.status(f"[bold green]Extracting {mod['file_name']}..."):
+            with _open_zip(zip_path) as z:
+                for member in z.infolist():
+                    if member.is_dir():
+                        continue
+                    orig = member.filename
+                    target_name = _reconstruct_sqlite_name(orig, clean_module_name)
+                    if target_name == orig and orig.startswith('.'):
+                        target_name = clean_module_name + orig
+                    target_path = module_path / target_name
+                    if module_root not in target_path.resolve().parents:
+                        console.print(f"[red]Skipping unsafe archive member '{escape(orig)}'.[/red]"); continue
+                    # Later members win on name clashes, as with sequential extraction
+                    jobs[target_name] = (member, target_path)
+                    final_files[target_name] = str(target_path)
+            _extract_zip_members(zip_path, list(jobs.values()))
+    except zipfile.BadZipFile as e:
+        zip_path.unlink(missing_ok=True)
+        console.print(f"[red]Corrupt archive for '{name}' removed from the download cache: {e}[/red]")
+        return False
 
     _inst_insert(
         {
@@ -692,7 +1256,8 @@ def install_single_module(name, version=None):
             "description": mod["description"],
             "type": mod["module_type"],
             "updatedate": mod["update_date"],
-            "installdate": datetime.now(timezone.utc).isoformat(),
+            "installdate": installdate,
+            "content_hash": content_hash,
         },
         final_files,
     )
@@ -702,27 +1267,60 @@ def install_single_module(name, version=None):
     )
     return True
 
-def remove_module(name, quiet=False):
-    """Remove a single installed module. Returns True on success."""
-    inst = _inst_get(name)
-    if not inst:
-        if not quiet:
-            console.print(f"[yellow]'{name}' is not installed.[/yellow]")
-        return False
-    mod_row, files = inst
+REMOVE_WORKERS = 8
+
+def _unlink_module_files(files):
+    """Unlinks the given installed files. Returns an error message, or None. Thread-safe."""
     for f in files:
         fp = Path(f["file_path"])
-        if fp.exists():
-            try:
-                fp.unlink() if fp.is_file() else shutil.rmtree(fp)
-            except OSError as e:
-                if not quiet:
-                    console.print(f"[red]Error removing {fp}: {e}[/red]")
-                return False
-    _inst_delete(mod_row["name"])
+        try:
+            fp.unlink() if not fp.is_dir() else shutil.rmtree(fp)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            return f"Error removing {fp}: {e}"
+    return None
+
+def remove_modules(names, quiet=False):
+    """
+    Remove installed modules. Records are looked up on this thread, files
+    of different modules are unlinked concurrently, then all records are
+    deleted in one transaction. Returns the names removed.
+    """
+    targets = {}
+    for name in _name_keys(names).values():
+        inst = _inst_get(name)
+        if not inst:
+            if not quiet:
+                console.print(f"[yellow]'{name}' is not installed.[/yellow]")
+            continue
+        mod_row, files = inst
+        if all(canonical != mod_row["name"] for canonical, _ in targets.values()):
+            targets[name] = (mod_row["name"], files)
+
+    file_lists = [files for _, files in targets.values()]
+    if len(file_lists) > 1:
+        with ThreadPoolExecutor(max_workers=min(len(file_lists), REMOVE_WORKERS)) as ex:
+            errors = list(ex.map(_unlink_module_files, file_lists))
+    else:
+        errors = [_unlink_module_files(files) for files in file_lists]
+
+    removed = {}
+    for (name, (canonical, _)), error in zip(targets.items(), errors):
+        if error:
+            if not quiet:
+                console.print(f"[red]{error}[/red]")
+            continue
+        removed[name] = canonical
+    _inst_delete(removed.values())
     if not quiet:
-        console.print(f"[green]Module '{name}' removed.[/green]")
-    return True
+        for name in removed:
+            console.print(f"[green]Module '{name}' removed.[/green]")
+    return list(removed)
+
+def remove_module(name, quiet=False):
+    """Remove a single installed module. Returns True on success."""
+    return bool(remove_modules([name], quiet))
 
 # ---------------------------------------------------------------------------
 # Install / remove / upgrade commands
@@ -760,16 +1358,14 @@ def install(names, version, reinstall):
 @use_installed_db
 def remove_command(names):
     """Remove one or more installed modules."""
-    for name in process_module_names(names):
-        remove_module(name)
+    remove_modules(process_module_names(names))
 
 @cli.command("uninstall", help="Remove one or more installed modules (synonym for remove).")
 @click.argument("names", nargs=-1, required=True)
 @use_installed_db
 def uninstall_command(names):
     """Remove one or more installed modules."""
-    for name in process_module_names(names):
-        remove_module(name)
+    remove_modules(process_module_names(names))
 
 @cli.command("upgrade")
 @click.argument("names", nargs=-1)
@@ -782,59 +1378,82 @@ def upgrade(names, upgrade_all):
     if is_cache_empty():
         console.print("[red]Cache is empty. Run 'update' first.[/red]"); return
 
-    to_upgrade = []
+    # Keyed by installed name: insertion-ordered, and repeated arguments
+    # ('kjv KJV', 'kjv,kjv') collapse into a single upgrade
+    to_upgrade = {}
     if upgrade_all:
-        pairs = _inst_list()
-        if not pairs:
+        if _inst_is_empty():
             console.print("[yellow]No modules installed, nothing to upgrade.[/yellow]"); return
-        for mod_row, _ in pairs:
-            latest = _cache_get_module(mod_row["name"])
-            if latest and latest["update_date"] > mod_row["updatedate"]:
-                to_upgrade.append(mod_row["name"])
+        # A single join against the attached cache returns only outdated modules
+        to_upgrade = dict.fromkeys(m["name"] for m in _inst_upgradable())
     else:
-        for name in process_module_names(names):
-            inst = _inst_get(name)
-            if not inst:
+        # One query answers "installed? cached? newer?" for all named modules
+        keys = _name_keys(process_module_names(names))
+        # SQL gets the spellings as given: NOCASE only folds ASCII
+        status = _inst_upgrade_status(keys.values())
+        for key, name in keys.items():
+            if key not in status:
                 console.print(f"[yellow]'{name}' is not installed.[/yellow]"); continue
-            mod_row, _ = inst
-            latest = _cache_get_module(name)
-            if not latest:
+            installed_name, in_cache, outdated = status[key]
+            if not in_cache:
                 console.print(f"[red]Module '{name}' not found in cache.[/red]"); continue
-            if latest["update_date"] > mod_row["updatedate"]:
-                to_upgrade.append(name)
+            if outdated:
+                to_upgrade[installed_name] = None
 
     if not to_upgrade:
         console.print("[green]All specified modules are up-to-date.[/green]"); return
     console.print(f"Found {len(to_upgrade)} module(s) to upgrade.")
+
+    # Downloads are network-bound and run concurrently; extraction and
+    # installed DB writes then proceed one module at a time
+    pending = {}
     for module_name in to_upgrade:
+        mod = _cache_get_module(module_name)
+        if mod and not _module_zip_path(mod).exists():
+            pending.setdefault(_module_zip_path(mod), dict(mod))
+    if pending:
+        with _download_progress() as progress, \
+             ThreadPoolExecutor(max_workers=min(len(pending), HTTP_POOL_SIZE)) as ex:
+            list(ex.map(lambda mod: _download_module(mod, progress), pending.values()))
+
+    for module_name in to_upgrade:
+        mod = _cache_get_module(module_name)
+        if mod and not _module_zip_path(mod).exists():
+            console.print(f"[red]Skipping '{module_name}', its download failed.[/red]"); continue
         console.print(f"--> Upgrading '{module_name}'...")
-        if remove_module(module_name, quiet=True):
-            install_single_module(module_name)
-        else:
-            console.print(f"[red]Failed to remove old version of '{module_name}', skipping.[/red]")
+        install_single_module(module_name, replace=True)
 
-@cli.command("versions", help="Show all available versions of a module.")
-@click.argument("name")
+@cli.command("versions", help="Show all available versions of one or more modules.")
+@click.argument("names", nargs=-1, required=True)
 @use_installed_db
-def versions(name):
+def versions(names):
     if is_cache_empty():
         console.print("[yellow]Cache empty. Run 'update' first.[/yellow]"); return
-    rows = _cache_versions(name)
-    if not rows:
-        console.print(f"[red]Module '{name}' not found.[/red]"); return
-    inst = _inst_get(name)
-    installed_version = inst[0]["updatedate"] if inst else None
-    content = Text()
-    for row in rows:
-        ver = row["update_date"]
-        marker = " [bold green](Installed)[/bold green]" if ver == installed_version else ""
-        content.append(f"{ver}{marker}\n")
-    console.print(Panel(content, title=f"Available Versions for {name}", box=ROUNDED, border_style="blue"))
+    from rich.box import ROUNDED
+    from rich.panel import Panel
+    from rich.text import Text
+    keys = _name_keys(process_module_names(names))
+    # One batched query per database, whatever the number of names. SQL gets
+    # the spellings as given (NOCASE only folds ASCII); results are keyed lowercased
+    available = _cache_versions(keys.values())
+    installed = _inst_versions(keys.values())
+    for key, name in keys.items():
+        dates = available.get(key)
+        if not dates:
+            console.print(f"[red]Module '{name}' not found.[/red]"); continue
+        installed_version = installed.get(key)
+        # Parsed as markup in one pass, so the installed marker renders styled
+        content = Text.from_markup("\n".join(
+            escape(ver) + (" [bold green](Installed)[/bold green]" if ver == installed_version else "")
+            for ver in dates
+        ))
+        console.print(Panel(content, title=f"Available Versions for {name}", box=ROUNDED, border_style="blue"))
 
 @cli.command("reinit", help="Reinitialize the default module sources.")
-def reinit():
+@click.option("-y", "--yes", is_flag=True, help="Do not ask for confirmation.")
+def reinit(yes):
     """Restore the default set of sources list."""
-    if click.confirm(
+    if yes or click.confirm(
         f"This will overwrite your current sources list.\n"
         f"Extra registries ('{CONFIG_DIR}/sources/<filename>.extra') will remain intact.\n"
         "Are you sure?"
@@ -843,21 +1462,22 @@ def reinit():
 
 @cli.command("purge", help="Clear cache or remove all configuration.")
 @click.option("--full", is_flag=True, help="Remove the entire configuration directory.")
-def purge(full):
+@click.option("-y", "--yes", is_flag=True, help="Do not ask for confirmation.")
+def purge(full, yes):
     """Remove cached downloads, registries, and optionally the entire config."""
     if full:
-        if click.confirm(
+        if yes or click.confirm(
             f"This will permanently delete the entire configuration directory at {CONFIG_DIR}. Are you sure?"
         ):
-            shutil.rmtree(CONFIG_DIR)
+            _trash_dir(CONFIG_DIR)
             console.print("[green]Entire configuration directory purged.[/green]")
     else:
-        if click.confirm(
+        if yes or click.confirm(
             f"This will delete all files in {CACHE_DIR} and {REGISTRY_CACHE_DIR}. Are you sure?"
         ):
-            if CACHE_DIR.exists(): shutil.rmtree(CACHE_DIR)
-            if REGISTRY_CACHE_DIR.exists(): shutil.rmtree(REGISTRY_CACHE_DIR)
-            if ETAG_CACHE_PATH.exists(): ETAG_CACHE_PATH.unlink()
+            _trash_dir(CACHE_DIR)
+            _trash_dir(REGISTRY_CACHE_DIR)
+            ETAG_CACHE_PATH.unlink(missing_ok=True)
             console.print("[green]Cache purged.[/green]")
 
 if __name__ == '__main__':